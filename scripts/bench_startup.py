@@ -0,0 +1,81 @@
+import sys
+import json
+import socket
+import time
+import argparse
+import subprocess
+
+import httpx
+
+
+def measure_import(runs: int) -> float:
+    # fresh interpreter per run so nothing is cached in sys.modules
+    code = "import time; t=time.perf_counter(); import src.slrpd.api.main; print(time.perf_counter()-t)"
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(samples) * 1000
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(client: httpx.Client, proc: subprocess.Popen, url: str, t0: float, deadline_s: float,
+             ok_status: int = 200) -> float:
+    while time.perf_counter() - t0 < deadline_s:
+        # if our uvicorn died (e.g. port taken) we must not time whatever else answers on that port
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode} before {url} answered")
+        try:
+            if client.get(url).status_code == ok_status:
+                return (time.perf_counter() - t0) * 1000
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} not {ok_status} after {deadline_s}s")
+
+
+def measure_server(port: int, deadline_s: float) -> dict:
+    port = port or free_port()
+    base = f"http://127.0.0.1:{port}"
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.slrpd.api.main:app", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            first_request_ms = wait_for(client, proc, f"{base}/live", t0, deadline_s)
+            ready_ms = wait_for(client, proc, f"{base}/ready", t0, deadline_s)
+            report = client.get(f"{base}/ready").json()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {"time_to_first_request_ms": round(first_request_ms, 1), "time_to_ready_ms": round(ready_ms, 1), "startup": report}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold-start benchmark for the SLRPD API (run from repo root).")
+    ap.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--deadline", type=float, default=60.0)
+    ap.add_argument("--max-first-request-ms", type=float, default=None,
+                    help="exit non-zero if time-to-first-request exceeds this budget")
+    args = ap.parse_args()
+
+    result = {"api_import_ms": round(measure_import(args.runs), 1)}
+    runs = [measure_server(args.port, args.deadline) for _ in range(args.runs)]
+    best = min(runs, key=lambda r: r["time_to_first_request_ms"])
+    result.update(best)
+    print(json.dumps(result, indent=2))
+
+    if args.max_first_request_ms is not None and best["time_to_first_request_ms"] > args.max_first_request_ms:
+        print(f"[FAIL] time_to_first_request_ms={best['time_to_first_request_ms']} > budget {args.max_first_request_ms}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
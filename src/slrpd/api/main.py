@@ -1,36 +1,42 @@
-import os
-from fastapi import FastAPI, HTTPException
-from typing import Dict, Optional, List
+import time
+_IMPORT_T0 = time.perf_counter()
+
+import json
+from contextlib import asynccontextmanager
+import anyio
+from fastapi import FastAPI, HTTPException, Header, Request, WebSocket, WebSocketDisconnect, WebSocketException, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.websockets import WebSocketState
+from typing import Dict, Optional, List, Set
 
 from ..config import settings
-from ..state_machine.policies import load_contracts
 from ..state_machine.transitions import (
     Session, step_discover, step_validate, step_sync, step_arm,
     step_deliver, step_cooldown, step_postcheck
 )
-from ..rag.index import SimpleCorpusIndex
 from ..rag.retrieve import rag_answer
 from ..observability.audit_log import read_events
 from ..observability.events import AuditEvent
 from ..observability.audit_log import append_event
+from ..observability.stream import BUS
 from ..execution.approvals import ApprovalRequest
 from ..execution.tools import run_tool
 
+from .runtime import RUNTIME
 from .schemas import AskRequest, AskResponse, ProposeActionRequest, ApproveRequest
 
-app = FastAPI(title="SLRPD Governed Agent", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # contracts and index load in the background so uvicorn binds immediately; /ready flips once done
+    if settings.warmup_on_startup:
+        RUNTIME.ensure_warmup()
+    yield
+
+app = FastAPI(title="SLRPD Governed Agent", version="0.1.0", lifespan=lifespan)
 
 SESSIONS: Dict[str, Session] = {}
 APPROVALS: Dict[str, ApprovalRequest] = {}
 
-CONTRACTS = load_contracts()
-
-INDEX = SimpleCorpusIndex()
-def _load_index():
-    os.makedirs(settings.corpus_dir, exist_ok=True)
-    INDEX.load_from_dir(settings.corpus_dir)
-_load_index()
-
 def _ensure_session(session_id: str) -> Session:
     s = SESSIONS.get(session_id)
     if not s:
@@ -43,16 +49,17 @@ def create_session():
 
 @app.post("/session/custom")
 def create_session_custom(destination_id: Optional[str] = None):
+    contracts = RUNTIME.contracts()
     s = Session()
     SESSIONS[s.id] = s
 
     step_discover(s, destination_id=destination_id)
-    ok = step_validate(s, CONTRACTS)
+    ok = step_validate(s, contracts)
 
     if ok and s.state.value == "Sync":
         step_sync(s)
     if ok:
-        step_arm(s, CONTRACTS)
+        step_arm(s, contracts)
 
     return {"session_id": s.id, "state": s.state.value, "outcome": s.outcome, "destination_id": s.destination_id}
 
@@ -68,8 +75,8 @@ def ask(session_id: str, req: AskRequest):
     if s.state.value != "Deliver":
         raise HTTPException(status_code=409, detail=f"session_not_in_deliver:{s.state.value}")
 
-    min_score = float(CONTRACTS.dp.get("tolerances", {}).get("min_retrieval_score", settings.min_retrieval_score_default))
-    out = rag_answer(INDEX, req.question, min_score=min_score)
+    min_score = float(RUNTIME.contracts().dp.get("tolerances", {}).get("min_retrieval_score", settings.min_retrieval_score_default))
+    out = rag_answer(RUNTIME.index(), req.question, min_score=min_score)
 
     append_event(AuditEvent(session_id=s.id, event_type="rag_query", state=s.state.value, data={
         "question": req.question,
@@ -90,14 +97,15 @@ def propose_action(session_id: str, req: ProposeActionRequest):
     if s.state.value != "Deliver":
         raise HTTPException(status_code=409, detail=f"session_not_in_deliver:{s.state.value}")
 
-    allowed = set(CONTRACTS.se.get("limits", {}).get("allowed_tools", []))
+    se = RUNTIME.contracts().se
+    allowed = set(se.get("limits", {}).get("allowed_tools", []))
     if req.action not in allowed:
         append_event(AuditEvent(session_id=s.id, event_type="action_blocked", state=s.state.value, data={
             "action": req.action, "reason": "not_in_allowlist"
         }))
         raise HTTPException(status_code=403, detail="action_not_allowed_by_policy")
 
-    if s.actions_count >= int(CONTRACTS.se.get("limits", {}).get("max_actions_per_session", 3)):
+    if s.actions_count >= int(se.get("limits", {}).get("max_actions_per_session", 3)):
         raise HTTPException(status_code=429, detail="max_actions_per_session_exceeded")
 
     ar = ApprovalRequest(session_id=s.id, action=req.action, payload=req.payload)
@@ -142,7 +150,7 @@ def finish(session_id: str):
 
     step_deliver(s, in_envelope=True)
     step_cooldown(s)
-    step_postcheck(s, CONTRACTS)
+    step_postcheck(s, RUNTIME.contracts())
     return {"session_id": s.id, "state": s.state.value, "outcome": s.outcome}
 
 @app.post("/session/{session_id}/simulate_out_of_envelope")
@@ -153,7 +161,7 @@ def simulate_out_of_envelope(session_id: str):
 
     step_deliver(s, in_envelope=False)
     step_cooldown(s)
-    step_postcheck(s, CONTRACTS)
+    step_postcheck(s, RUNTIME.contracts())
     return {"session_id": s.id, "state": s.state.value, "outcome": s.outcome}
 
 @app.get("/session/{session_id}/audit")
@@ -167,3 +175,116 @@ def audit(session_id: str):
         "deferred_queries": s.deferred_queries,
         "events": read_events(s.id)
     }
+
+def _parse_event_types(event_types: Optional[str]) -> Optional[Set[str]]:
+    if not event_types:
+        return None
+    return {t.strip() for t in event_types.split(",") if t.strip()}
+
+def _subscribe(session_id: Optional[str], event_types: Optional[str], cursor: Optional[int]):
+    return BUS.subscribe(session_id=session_id, event_types=_parse_event_types(event_types), cursor=cursor,
+                         backfill=read_events if session_id is not None else None)
+
+def _reset_frame(sub) -> Dict:
+    # cursor could not be resumed from memory; per-session streams were backfilled from disk,
+    # fleet-wide clients should resync each session from GET /session/{id}/audit
+    return {**sub.gap, "resync": "backfilled" if "backfilled" in sub.gap else "GET /session/{id}/audit"}
+
+def _sse_stream(request: Request, session_id: Optional[str], event_types: Optional[str], cursor: Optional[int]):
+    async def gen():
+        sub = _subscribe(session_id, event_types, cursor)
+        try:
+            yield "retry: 3000\n\n"
+            if sub.gap is not None:
+                yield f"event: reset\ndata: {json.dumps(_reset_frame(sub))}\n\n"
+            while not await request.is_disconnected():
+                items, dropped = await BUS.next_batch(sub, timeout=settings.stream_keepalive_s)
+                if dropped:
+                    yield f"event: dropped\ndata: {json.dumps({'dropped': dropped, 'total_dropped': sub.dropped})}\n\n"
+                if not items and not dropped:
+                    yield ": keepalive\n\n"
+                for item in items:
+                    ev = item["event"]
+                    event_id = f"id: {item['seq']}\n" if item["seq"] is not None else ""
+                    yield f"{event_id}event: {ev['event_type']}\ndata: {json.dumps(ev)}\n\n"
+        finally:
+            BUS.unsubscribe(sub)
+    return StreamingResponse(gen(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+def _resume_cursor(cursor: Optional[int], last_event_id: Optional[str]) -> Optional[int]:
+    if cursor is not None:
+        return cursor
+    if last_event_id and last_event_id.isdigit():
+        return int(last_event_id)
+    return None
+
+@app.get("/events/stream")
+def events_stream(request: Request, session_id: Optional[str] = None, event_types: Optional[str] = None,
+                  cursor: Optional[int] = None, last_event_id: Optional[str] = Header(default=None)):
+    if session_id is not None:
+        _ensure_session(session_id)
+    return _sse_stream(request, session_id, event_types, _resume_cursor(cursor, last_event_id))
+
+@app.get("/session/{session_id}/events/stream")
+def session_events_stream(session_id: str, request: Request, event_types: Optional[str] = None,
+                          cursor: Optional[int] = None, last_event_id: Optional[str] = Header(default=None)):
+    _ensure_session(session_id)
+    return _sse_stream(request, session_id, event_types, _resume_cursor(cursor, last_event_id))
+
+@app.websocket("/events/ws")
+async def events_ws(websocket: WebSocket, session_id: Optional[str] = None, event_types: Optional[str] = None,
+                    cursor: Optional[int] = None):
+    if session_id is not None and session_id not in SESSIONS:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="session_not_found")
+    await websocket.accept()
+    sub = _subscribe(session_id, event_types, cursor)
+
+    async def send_loop():
+        try:
+            if sub.gap is not None:
+                await websocket.send_json({"type": "reset", **_reset_frame(sub)})
+            while True:
+                items, dropped = await BUS.next_batch(sub, timeout=settings.stream_keepalive_s)
+                if dropped:
+                    await websocket.send_json({"type": "dropped", "dropped": dropped, "total_dropped": sub.dropped})
+                if not items and not dropped:
+                    await websocket.send_json({"type": "keepalive"})
+                for item in items:
+                    await websocket.send_json({"type": "event", "seq": item["seq"], "event": item["event"]})
+        except WebSocketDisconnect:
+            pass
+        except RuntimeError:
+            # starlette raises RuntimeError for a send on a socket that already closed; anything else is a bug
+            if WebSocketState.DISCONNECTED not in (websocket.client_state, websocket.application_state):
+                raise
+        tg.cancel_scope.cancel()
+
+    async def receive_loop():
+        # processes close frames promptly; clients are not expected to send anything else
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+        tg.cancel_scope.cancel()
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(send_loop)
+            tg.start_soon(receive_loop)
+    finally:
+        BUS.unsubscribe(sub)
+
+@app.get("/events/stats")
+def events_stats():
+    return BUS.stats()
+
+@app.get("/live")
+def live():
+    return {"live": True}
+
+@app.get("/ready")
+def ready():
+    # covers warmup_on_startup=False and retries a failed warmup; the probe itself never blocks on loading
+    RUNTIME.ensure_warmup()
+    report = RUNTIME.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+RUNTIME.timings["api_import_ms"] = round((time.perf_counter() - _IMPORT_T0) * 1000, 3)
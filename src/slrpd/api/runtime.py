@@ -0,0 +1,80 @@
+import threading, time
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+from ..state_machine.policies import Contracts, load_contracts
+from ..rag.index import SimpleCorpusIndex, sklearn_deps
+
+class Runtime:
+    """Lazily loaded contracts and RAG index behind a readiness flag.
+
+    Nothing heavy happens at import time: `warmup` (started in the background on app
+    startup or by the first `/ready` probe) or the first request that needs a resource
+    loads it, and the per-phase timings are kept for the `/ready` startup report.
+    """
+
+    def __init__(self):
+        self._contracts: Optional[Contracts] = None
+        self._index: Optional[SimpleCorpusIndex] = None
+        self._contracts_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._warmup: Optional[threading.Thread] = None
+        self._warmup_lock = threading.Lock()
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._contracts is not None and self._index is not None
+
+    def _timed(self, name: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        out = fn()
+        self.timings[name] = round((time.perf_counter() - t0) * 1000, 3)
+        return out
+
+    def contracts(self) -> Contracts:
+        if self._contracts is None:
+            with self._contracts_lock:
+                if self._contracts is None:
+                    self._contracts = self._timed("contracts_load_ms", load_contracts)
+                    self._clear_error()
+        return self._contracts
+
+    def index(self) -> SimpleCorpusIndex:
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._timed("heavy_imports_ms", sklearn_deps)
+                    idx = SimpleCorpusIndex()
+                    self._timed("index_build_ms", lambda: idx.load_from_dir(settings.corpus_dir))
+                    self._index = idx
+                    self._clear_error()
+        return self._index
+
+    def _clear_error(self):
+        # a later lazy load can succeed after a failed warmup; don't report a stale error
+        if self.ready:
+            self.error = None
+
+    def warmup(self):
+        try:
+            self.contracts()
+            self.index()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+    def ensure_warmup(self) -> Optional[threading.Thread]:
+        """Start warmup unless ready or already running; retries after a failed attempt."""
+        with self._warmup_lock:
+            if self.ready:
+                return None
+            if self._warmup is None or not self._warmup.is_alive():
+                self._warmup = threading.Thread(target=self.warmup, name="slrpd-warmup", daemon=True)
+                self._warmup.start()
+            return self._warmup
+
+    def report(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "error": self.error, "timings_ms": dict(self.timings)}
+
+RUNTIME = Runtime()
@@ -5,6 +5,15 @@ class Settings(BaseSettings):
     corpus_dir: str = '.data/corpus'
     audit_dir: str = '.data/audit'
     reports_dir: str = '.data/reports'
+    report_compression: str = 'none'  # none | gzip | zstd
+    report_compress_min_bytes: int = 64 * 1024
+    report_batched: bool = False
+    report_segment_max_bytes: int = 8 * 1024 * 1024
+    report_batch_max: int = 256
+    stream_buffer_size: int = 256
+    stream_history_size: int = 1024
+    stream_keepalive_s: float = 15.0
+    warmup_on_startup: bool = True
     min_retrieval_score_default: float = 0.15
 
 settings = Settings()
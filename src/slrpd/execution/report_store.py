@@ -0,0 +1,304 @@
+import os, json, gzip, hashlib, queue, tempfile, threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+from ..config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for report_compression="zstd"
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: segments are only guarded by the in-process lock
+    fcntl = None
+
+COMPRESSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+def _current_umask() -> int:
+    # read it without a set-to-0 window: other threads creating files meanwhile would get 0666
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    um = os.umask(0o022)  # no procfs: a conservative value is the worst anyone sees meanwhile
+    os.umask(um)
+    return um
+
+_UMASK = _current_umask()
+
+def _digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+def _canonical(title: str, payload: Dict[str, Any]) -> bytes:
+    return json.dumps({"title": title, "payload": payload}, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def _compress(raw: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(raw)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(raw)
+    return raw
+
+def _decompress(raw: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(raw)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard_not_installed")
+        return zstandard.ZstdDecompressor().decompress(raw)
+    return raw
+
+def _fsync_close(f):
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+def atomic_write(path: str, data: bytes):
+    d = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp-")
+    try:
+        # mkstemp creates 0600; give the final file the same mode a plain open() would
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class ReportStore:
+    """Content-addressed report storage; identical reports are stored once in either mode.
+
+    File mode writes one `<sha256>.json[.gz|.zst]` per report via temp file + rename,
+    so concurrent writers never see a torn file, and returns its `report_path`.
+    Batched mode queues reports to a writer thread that group-commits whatever has
+    accumulated into rolling `segments/segment-NNNNNN.seg` files with a single fsync,
+    records `{report_id, segment, offset, length, bytes, compression}` in `segments/index.jsonl`
+    and returns `segment`/`offset` instead of a path. The index is mirrored in memory and
+    caught up incrementally, so lookups and dedupe checks do not rescan the file.
+    Appends are serialized across worker processes with an flock on `segments/.lock`.
+    """
+
+    def __init__(self, reports_dir: Optional[str] = None, compression: Optional[str] = None,
+                 compress_min_bytes: Optional[int] = None, batched: Optional[bool] = None,
+                 segment_max_bytes: Optional[int] = None, batch_max: Optional[int] = None):
+        self.reports_dir = reports_dir or settings.reports_dir
+        self.compression = compression or settings.report_compression
+        self.compress_min_bytes = settings.report_compress_min_bytes if compress_min_bytes is None else compress_min_bytes
+        self.batched = settings.report_batched if batched is None else batched
+        self.segment_max_bytes = segment_max_bytes or settings.report_segment_max_bytes
+        self.batch_max = batch_max or settings.report_batch_max
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"unknown_report_compression:{self.compression}")
+        if self.compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstandard_not_installed")
+        self._lock = threading.Lock()
+        self._segment_no: Optional[int] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}  # report_id -> index entry, loaded incrementally
+        self._index_pos = 0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    @property
+    def segments_dir(self) -> str:
+        return os.path.join(self.reports_dir, "segments")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.segments_dir, "index.jsonl")
+
+    def write(self, title: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.batched:
+            return self._write_file(title, payload)
+        fut: Future = Future()
+        self._queue.put((title, payload, fut))
+        self._ensure_writer()
+        return fut.result()
+
+    def write_many(self, reports: List[tuple]) -> List[Dict[str, Any]]:
+        if self.batched:
+            return self._append_segment(reports)
+        return [self._write_file(title, payload) for title, payload in reports]
+
+    def _compression_for(self, raw: bytes) -> str:
+        return self.compression if len(raw) >= self.compress_min_bytes else "none"
+
+    def _write_file(self, title: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        os.makedirs(self.reports_dir, exist_ok=True)
+        raw = _canonical(title, payload)
+        report_id = _digest(raw)
+        compression = self._compression_for(raw)
+        path = os.path.join(self.reports_dir, f"{report_id}.json{COMPRESSIONS[compression]}")
+        if not os.path.exists(path):
+            atomic_write(path, _compress(raw, compression))
+        return {"report_id": report_id, "report_path": path, "bytes": len(raw), "compression": compression}
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="slrpd-report-writer", daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # everything that queued up while the previous fsync ran goes out in one commit
+            while len(batch) < self.batch_max:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                results = self._append_segment([(title, payload) for title, payload, _ in batch])
+            except BaseException as e:
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, _, fut), res in zip(batch, results):
+                fut.set_result(res)
+
+    def _segment_path(self, n: int) -> str:
+        return os.path.join(self.segments_dir, f"segment-{n:06d}.seg")
+
+    def _current_segment(self) -> int:
+        n = self._segment_no
+        if n is None:
+            existing = [fn for fn in os.listdir(self.segments_dir) if fn.startswith("segment-") and fn.endswith(".seg")]
+            n = max([int(fn[8:14]) for fn in existing], default=1)
+        while os.path.exists(self._segment_path(n + 1)):  # another worker rolled over
+            n += 1
+        return n
+
+    @contextmanager
+    def _flock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.segments_dir, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _terminate_torn_tail(self):
+        # a writer that crashed mid-append leaves a line without "\n"; close it off so the next
+        # entry starts on its own line instead of being glued onto the fragment
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _refresh_index(self):
+        """Fold index lines appended since the last refresh (by any process) into `_entries`."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_pos)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # only complete lines; an unterminated tail is picked up later
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:  # torn line from a crashed writer
+                continue
+            self._entries.setdefault(entry["report_id"], entry)
+        self._index_pos += end
+
+    @staticmethod
+    def _segment_result(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {"report_id": entry["report_id"], "segment": entry["segment"], "offset": entry["offset"],
+                "bytes": entry.get("bytes"), "compression": entry.get("compression", "none")}
+
+    def _append_segment(self, reports: List[tuple]) -> List[Dict[str, Any]]:
+        out = []
+        with self._lock:
+            os.makedirs(self.segments_dir, exist_ok=True)
+            with self._flock():
+                self._terminate_torn_tail()
+                self._refresh_index()
+                pending: Dict[str, Dict[str, Any]] = {}
+                n = self._segment_no
+                seg = None
+                try:
+                    for title, payload in reports:
+                        raw = _canonical(title, payload)
+                        report_id = _digest(raw)
+                        known = self._entries.get(report_id) or pending.get(report_id)
+                        if known is not None:
+                            out.append(self._segment_result(known))
+                            continue
+                        compression = self._compression_for(raw)
+                        blob = _compress(raw, compression)
+                        if seg is None:
+                            n = self._current_segment()
+                            seg = open(self._segment_path(n), "ab")
+                        offset = seg.tell()
+                        if offset > 0 and offset + len(blob) > self.segment_max_bytes:
+                            _fsync_close(seg)
+                            n += 1
+                            seg = open(self._segment_path(n), "ab")
+                            offset = seg.tell()
+                        seg.write(blob)
+                        entry = {
+                            "report_id": report_id, "title": title, "segment": os.path.basename(self._segment_path(n)),
+                            "offset": offset, "length": len(blob), "bytes": len(raw), "compression": compression
+                        }
+                        pending[report_id] = entry
+                        out.append(self._segment_result(entry))
+                    if seg is not None:
+                        _fsync_close(seg)
+                finally:
+                    if seg is not None:
+                        seg.close()
+                        self._segment_no = n
+                if pending:
+                    # index is written after the segment data is durable, so every index entry points at complete bytes
+                    index = open(self.index_path, "a", encoding="utf-8")
+                    index.writelines(json.dumps(e) + "\n" for e in pending.values())
+                    _fsync_close(index)
+                    self._refresh_index()
+        return out
+
+    def read(self, report_id: str) -> Optional[Dict[str, Any]]:
+        for compression, ext in COMPRESSIONS.items():
+            path = os.path.join(self.reports_dir, f"{report_id}.json{ext}")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return json.loads(_decompress(f.read(), compression))
+        with self._lock:
+            self._refresh_index()
+            entry = self._entries.get(report_id)
+        if entry is None:
+            return None
+        with open(os.path.join(self.segments_dir, entry["segment"]), "rb") as seg:
+            seg.seek(entry["offset"])
+            raw = seg.read(entry["length"])
+        return json.loads(_decompress(raw, entry.get("compression", "none")))
+
+_STORE: Optional[ReportStore] = None
+_STORE_LOCK = threading.Lock()
+
+def get_store() -> ReportStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ReportStore()
+    return _STORE
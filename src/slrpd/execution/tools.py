@@ -1,6 +1,5 @@
-import os, json
 from typing import Dict, Any
-from ..config import settings
+from .report_store import get_store
 
 ALLOWED_TOOLS = {"create_report"}
 
@@ -8,11 +7,7 @@ def run_tool(tool_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     if tool_name not in ALLOWED_TOOLS:
         raise ValueError("tool_not_allowed")
 
-    os.makedirs(settings.reports_dir, exist_ok=True)
     title = payload.get("title", "report")
-    path = os.path.join(settings.reports_dir, f"{title.replace(' ', '_')}.json")
+    stored = get_store().write(title, payload)
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"title": title, "payload": payload}, f, indent=2)
-
-    return {"tool": tool_name, "report_path": path}
+    return {"tool": tool_name, **stored}
@@ -1,6 +1,7 @@
 import os, json, hashlib
 from typing import List
 from .events import AuditEvent
+from .stream import BUS
 from ..config import settings
 
 def _ensure_dirs():
@@ -19,6 +20,7 @@ def append_event(ev: AuditEvent) -> AuditEvent:
     path = os.path.join(settings.audit_dir, f"{ev.session_id}.jsonl")
     with open(path, "a", encoding="utf-8") as f:
         f.write(json.dumps(payload) + "\n")
+    BUS.publish(payload)
     return ev
 
 def read_events(session_id: str) -> List[dict]:
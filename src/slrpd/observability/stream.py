@@ -0,0 +1,157 @@
+import asyncio, itertools, threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from ..config import settings
+
+class Subscriber:
+    """Bounded per-client buffer. When full the oldest event is dropped and counted.
+
+    The cap applies to live traffic only; a resync backfill sits in `backlog`, is delivered
+    first and is never evicted.
+    """
+
+    def __init__(self, session_id: Optional[str], event_types: Optional[Set[str]], maxsize: int,
+                 loop: asyncio.AbstractEventLoop):
+        self.session_id = session_id
+        self.event_types = event_types or None
+        self.maxsize = maxsize
+        self.buffer: Deque[Dict[str, Any]] = deque()
+        self.backlog: Deque[Dict[str, Any]] = deque()
+        self.dropped = 0
+        self.pending_drops = 0
+        self.gap: Optional[Dict[str, Any]] = None  # set when the resume cursor could not be honoured
+        self._skip: Set[str] = set()  # integrity hashes already delivered by a disk backfill
+        self._loop = loop
+        self._wake = asyncio.Event()
+
+    def matches(self, ev: Dict[str, Any]) -> bool:
+        if self.session_id is not None and ev.get("session_id") != self.session_id:
+            return False
+        if self.event_types is not None and ev.get("event_type") not in self.event_types:
+            return False
+        return True
+
+    def offer(self, item: Dict[str, Any]):
+        if self._skip and item["event"].get("integrity_hash") in self._skip:
+            return
+        if len(self.buffer) >= self.maxsize:
+            self.buffer.popleft()
+            self.dropped += 1
+            self.pending_drops += 1
+        self.buffer.append(item)
+        self.wake()
+
+    def wake(self):
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:  # loop already closed; client is gone
+            pass
+
+class EventBus:
+    """In-process fan-out for audit events.
+
+    `publish` is called from `append_event` (threadpool workers for sync endpoints);
+    subscribers are drained from the event loop. Every event gets a monotonically
+    increasing `seq` which clients pass back as a cursor to resume from the retained history.
+    `seq` is per process: a cursor outside the retained range (too old, or from before a
+    restart / another worker) sets `Subscriber.gap` so the client knows to resync.
+    """
+
+    def __init__(self, history_size: Optional[int] = None, buffer_size: Optional[int] = None):
+        self.history_size = history_size or settings.stream_history_size
+        self.buffer_size = buffer_size or settings.stream_buffer_size
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=self.history_size)
+        self._subs: List[Subscriber] = []
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+    def publish(self, ev: Dict[str, Any]) -> int:
+        with self._lock:
+            seq = next(self._seq)
+            self._last_seq = seq
+            item = {"seq": seq, "event": ev}
+            self._history.append(item)
+            for sub in self._subs:
+                if sub.matches(ev):
+                    sub.offer(item)
+        return seq
+
+    def subscribe(self, session_id: Optional[str] = None, event_types: Optional[Set[str]] = None,
+                  cursor: Optional[int] = None,
+                  backfill: Optional[Callable[[str], List[Dict[str, Any]]]] = None) -> Subscriber:
+        """Register a subscriber, replaying retained events after `cursor`.
+
+        For per-session subscriptions, `backfill(session_id)` (normally `read_events`) is used
+        to replay the full session log from disk when the cursor falls outside the ring.
+        """
+        sub = Subscriber(session_id, event_types, self.buffer_size, asyncio.get_running_loop())
+        with self._lock:
+            if cursor is not None:
+                oldest = self._history[0]["seq"] if self._history else self._last_seq + 1
+                if cursor < oldest - 1:
+                    sub.gap = {"reason": "cursor_expired", "cursor": cursor, "oldest_seq": oldest, "last_seq": self._last_seq}
+                elif cursor > self._last_seq:
+                    sub.gap = {"reason": "cursor_unknown", "cursor": cursor, "oldest_seq": oldest, "last_seq": self._last_seq}
+                else:
+                    for item in self._history:
+                        if item["seq"] > cursor and sub.matches(item["event"]):
+                            sub.offer(item)
+            self._subs.append(sub)
+
+        if sub.gap is not None and session_id is not None and backfill is not None:
+            # read outside the bus lock; events published meanwhile are buffered and de-duplicated by hash
+            events = [ev for ev in backfill(session_id) if sub.matches(ev)]
+            hashes = {ev.get("integrity_hash") for ev in events if ev.get("integrity_hash")}
+            with self._lock:
+                live = [item for item in sub.buffer if item["event"].get("integrity_hash") not in hashes]
+                sub.buffer.clear()
+                sub.buffer.extend(live)
+                sub.backlog.extend({"seq": None, "event": ev} for ev in events)
+                sub._skip = hashes
+                sub.wake()
+            sub.gap["backfilled"] = len(events)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    async def next_batch(self, sub: Subscriber, timeout: Optional[float] = None):
+        """Wait for events; returns (items, dropped_since_last_batch). Empty items on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._lock:
+                if sub.backlog or sub.buffer or sub.pending_drops:
+                    items = list(sub.backlog) + list(sub.buffer)
+                    sub.backlog.clear()
+                    sub.buffer.clear()
+                    dropped, sub.pending_drops = sub.pending_drops, 0
+                    sub._wake.clear()
+                    return items, dropped
+                # a wake scheduled before this point may still fire; the loop re-checks the buffer
+                sub._wake.clear()
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return [], 0
+            try:
+                await asyncio.wait_for(sub._wake.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "last_seq": self._last_seq,
+                "history": len(self._history),
+                "subscribers": [
+                    {"session_id": s.session_id, "event_types": sorted(s.event_types or []),
+                     "buffered": len(s.backlog) + len(s.buffer), "dropped": s.dropped}
+                    for s in self._subs
+                ],
+            }
+
+BUS = EventBus()
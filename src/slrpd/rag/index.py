@@ -1,15 +1,20 @@
 import os, json
 from typing import List, Dict, Any, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+def sklearn_deps():
+    # imported on first use: scikit-learn dominates import time and most processes never build an index
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+    return TfidfVectorizer, cosine_similarity
 
 class SimpleCorpusIndex:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words="english")
+        self.vectorizer = None
         self.docs: List[Dict[str, Any]] = []
         self.matrix = None
 
     def load_from_dir(self, corpus_dir: str):
+        TfidfVectorizer, _ = sklearn_deps()
         self.docs = []
         os.makedirs(corpus_dir, exist_ok=True)
         for fn in sorted(os.listdir(corpus_dir)):
@@ -17,11 +22,13 @@ class SimpleCorpusIndex:
                 with open(os.path.join(corpus_dir, fn), "r", encoding="utf-8") as f:
                     self.docs.append(json.load(f))
         texts = [d.get("text", "") for d in self.docs] or [""]
+        self.vectorizer = TfidfVectorizer(stop_words="english")
         self.matrix = self.vectorizer.fit_transform(texts)
 
     def search(self, query: str, k: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
         if self.matrix is None:
             return []
+        _, cosine_similarity = sklearn_deps()
         qv = self.vectorizer.transform([query])
         sims = cosine_similarity(qv, self.matrix)[0]
         ranked = sorted(list(enumerate(sims)), key=lambda x: x[1], reverse=True)[:k]
@@ -0,0 +1,97 @@
+import os
+import stat
+import threading
+
+from src.slrpd.execution.report_store import ReportStore
+
+
+def test_same_title_different_payloads_get_different_files(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=False)
+    a = store.write("weekly", {"x": 1})
+    b = store.write("weekly", {"x": 2})
+    assert a["report_path"] != b["report_path"]
+    assert store.read(a["report_id"])["payload"] == {"x": 1}
+    assert store.read(b["report_id"])["payload"] == {"x": 2}
+
+
+def test_identical_reports_dedupe(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=False)
+    a = store.write("r", {"k": "v"})
+    b = store.write("r", {"k": "v"})
+    assert a == b
+    assert [fn for fn in os.listdir(tmp_path)] == [os.path.basename(a["report_path"])]
+
+
+def test_report_file_follows_umask(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=False)
+    path = store.write("r", {})["report_path"]
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+
+def test_compression_threshold(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="gzip", compress_min_bytes=200, batched=False)
+    small = store.write("s", {"x": "y"})
+    large = store.write("l", {"x": "y" * 500})
+    assert small["compression"] == "none" and small["report_path"].endswith(".json")
+    assert large["compression"] == "gzip" and large["report_path"].endswith(".json.gz")
+    assert store.read(large["report_id"])["payload"] == {"x": "y" * 500}
+
+
+def test_batched_compression_and_result_shape(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="gzip", compress_min_bytes=0, batched=True)
+    res = store.write("big", {"x": "z" * 1000})
+    assert set(res) == {"report_id", "segment", "offset", "bytes", "compression"}
+    assert res["compression"] == "gzip"
+    assert os.path.getsize(os.path.join(store.segments_dir, res["segment"])) < 1000
+    assert store.read(res["report_id"])["payload"] == {"x": "z" * 1000}
+
+
+def test_batched_identical_reports_dedupe(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True)
+    a = store.write("r", {"k": "v"})
+    b, c = store.write_many([("r", {"k": "v"}), ("r", {"k": "v"})])
+    assert a == b == c
+    restarted = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True)
+    assert restarted.write("r", {"k": "v"}) == a
+    with open(store.index_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_write_after_torn_index_tail_is_readable(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True)
+    a = store.write("a", {})
+    with open(store.index_path, "a", encoding="utf-8") as f:
+        f.write('{"report_id": "dead')  # writer crashed mid-line
+    fresh = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True)
+    b = fresh.write("b", {})
+    assert fresh.read(a["report_id"])["title"] == "a"
+    assert fresh.read(b["report_id"])["title"] == "b"
+    assert ReportStore(reports_dir=str(tmp_path), batched=True).read(b["report_id"])["title"] == "b"
+
+
+def test_segment_rollover_and_read_after_restart(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True, segment_max_bytes=300)
+    res = store.write_many([("t", {"i": i, "pad": "z" * 50}) for i in range(8)])
+    assert len({r["segment"] for r in res}) > 1
+
+    restarted = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True, segment_max_bytes=300)
+    for i, r in enumerate(res):
+        assert restarted.read(r["report_id"]) == {"title": "t", "payload": {"i": i, "pad": "z" * 50}}
+    more = restarted.write("after", {})
+    assert more["segment"] >= res[-1]["segment"]
+    assert restarted.read(more["report_id"])["title"] == "after"
+
+
+def test_concurrent_batched_writes_are_all_indexed(tmp_path):
+    store = ReportStore(reports_dir=str(tmp_path), compression="none", batched=True)
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(store.write("c", {"i": i}))) for i in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 32
+    for r in results:
+        assert store.read(r["report_id"])["title"] == "c"
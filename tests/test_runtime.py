@@ -0,0 +1,51 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from src.slrpd.config import settings
+from src.slrpd.api import main
+from src.slrpd.api.runtime import Runtime
+
+
+def _seed(corpus_dir):
+    corpus_dir.mkdir(exist_ok=True)
+    (corpus_dir / "doc-001.json").write_text(json.dumps({"id": "doc-001", "title": "t", "text": "silicon photonics"}))
+
+
+def test_failed_warmup_is_retried_and_error_cleared(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "corpus_dir", str(tmp_path / "corpus"))
+    rt = Runtime()
+    rt.ensure_warmup().join()
+    assert not rt.ready and rt.error  # empty corpus: no vocabulary
+
+    _seed(tmp_path / "corpus")
+    rt.ensure_warmup().join()
+    assert rt.ready and rt.error is None
+    assert rt.ensure_warmup() is None
+    assert {"contracts_load_ms", "heavy_imports_ms", "index_build_ms"} <= set(rt.report()["timings_ms"])
+
+
+def test_lazy_load_clears_stale_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "corpus_dir", str(tmp_path / "corpus"))
+    rt = Runtime()
+    rt.warmup()
+    assert rt.error
+    _seed(tmp_path / "corpus")
+    rt.index()
+    assert rt.report()["ready"] and rt.report()["error"] is None
+
+
+def test_ready_probe_starts_warmup_without_startup_hook(tmp_path, monkeypatch):
+    _seed(tmp_path / "corpus")
+    monkeypatch.setattr(settings, "corpus_dir", str(tmp_path / "corpus"))
+    monkeypatch.setattr(settings, "warmup_on_startup", False)
+    rt = Runtime()
+    monkeypatch.setattr(main, "RUNTIME", rt)
+    with TestClient(main.app) as client:
+        assert client.get("/live").status_code == 200
+        deadline = time.monotonic() + 30
+        while (resp := client.get("/ready")).status_code == 503 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert resp.status_code == 200
+        assert resp.json()["error"] is None
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.slrpd.config import settings
+from src.slrpd.observability.stream import EventBus
+
+
+def _ev(i, session_id="a", event_type="x"):
+    return {"session_id": session_id, "event_type": event_type, "i": i, "integrity_hash": f"h{session_id}{i}"}
+
+
+def test_drop_accounting_keeps_newest():
+    async def run():
+        bus = EventBus(history_size=10, buffer_size=3)
+        sub = bus.subscribe()
+        for i in range(5):
+            bus.publish(_ev(i))
+        items, dropped = await bus.next_batch(sub, timeout=1)
+        assert [it["event"]["i"] for it in items] == [2, 3, 4]
+        assert dropped == 2 and sub.dropped == 2
+    asyncio.run(run())
+
+
+def test_cursor_replay_within_history():
+    async def run():
+        bus = EventBus(history_size=10, buffer_size=10)
+        for i in range(4):
+            bus.publish(_ev(i))
+        sub = bus.subscribe(session_id="a", cursor=2)
+        items, _ = await bus.next_batch(sub, timeout=1)
+        assert [it["seq"] for it in items] == [3, 4]
+        assert sub.gap is None
+    asyncio.run(run())
+
+
+def test_expired_and_unknown_cursor_set_gap():
+    async def run():
+        bus = EventBus(history_size=5, buffer_size=10)
+        for i in range(8):
+            bus.publish(_ev(i))
+        expired = bus.subscribe(cursor=0)
+        assert expired.gap["reason"] == "cursor_expired" and expired.gap["oldest_seq"] == 4
+        unknown = bus.subscribe(cursor=99)
+        assert unknown.gap["reason"] == "cursor_unknown"
+        assert not expired.buffer and not unknown.buffer
+    asyncio.run(run())
+
+
+def test_session_gap_backfills_from_disk_without_duplicates():
+    async def run():
+        bus = EventBus(history_size=2, buffer_size=50)
+        disk = [_ev(i) for i in range(6)]
+        for ev in disk:
+            bus.publish(ev)
+
+        def backfill(session_id):
+            bus.publish(disk[-1])  # written to disk, published while we were reading
+            bus.publish(_ev(6))
+            return disk
+
+        sub = bus.subscribe(session_id="a", cursor=0, backfill=backfill)
+        items, _ = await bus.next_batch(sub, timeout=1)
+        assert [it["event"]["i"] for it in items] == [0, 1, 2, 3, 4, 5, 6]
+        assert sub.gap["backfilled"] == 6
+    asyncio.run(run())
+
+
+def test_backfill_longer_than_buffer_is_delivered_in_full():
+    async def run():
+        bus = EventBus(history_size=2, buffer_size=3)
+        disk = [_ev(i) for i in range(6)]
+        sub = bus.subscribe(session_id="a", cursor=5, backfill=lambda session_id: disk)
+        bus.publish(_ev(6))
+        items, dropped = await bus.next_batch(sub, timeout=1)
+        assert [it["event"]["i"] for it in items] == [0, 1, 2, 3, 4, 5, 6]
+        assert dropped == 0 and sub.gap["backfilled"] == 6
+    asyncio.run(run())
+
+
+def test_cross_thread_publish_wakes_subscriber():
+    async def run():
+        bus = EventBus(history_size=100, buffer_size=100)
+        sub = bus.subscribe(event_types={"y"})
+        t = threading.Thread(target=lambda: [bus.publish(_ev(i, event_type="y" if i % 2 else "x")) for i in range(10)])
+        t.start()
+        got = []
+        while len(got) < 5:
+            items, _ = await bus.next_batch(sub, timeout=2)
+            assert items
+            got += items
+        t.join()
+        assert [it["event"]["i"] for it in got] == [1, 3, 5, 7, 9]
+    asyncio.run(run())
+
+
+def test_stale_wake_does_not_return_empty_batch():
+    async def run():
+        bus = EventBus(history_size=10, buffer_size=10)
+        sub = bus.subscribe()
+        bus.publish(_ev(0))
+        sub._loop.call_soon_threadsafe(sub._wake.set)  # extra wake scheduled before the drain
+        items, _ = await bus.next_batch(sub, timeout=1)
+        assert len(items) == 1
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        items, dropped = await bus.next_batch(sub, timeout=0.2)
+        assert (items, dropped) == ([], 0)
+        assert loop.time() - t0 >= 0.15
+    asyncio.run(run())
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "audit_dir", str(tmp_path / "audit"))
+    from src.slrpd.api.main import app
+    return TestClient(app)
+
+
+def test_ws_streams_session_events(client):
+    session_id = client.post("/session").json()["session_id"]
+    with client.websocket_connect(f"/events/ws?session_id={session_id}&cursor=999999") as ws:
+        msg = ws.receive_json()
+        assert msg["type"] == "reset" and msg["backfilled"] >= 1
+        types = [ws.receive_json()["event"]["event_type"] for _ in range(msg["backfilled"])]
+        assert types[0] == "destination_selected"
+    assert client.get("/events/stats").json()["subscribers"] == []
+
+
+def test_ws_unknown_session_is_rejected(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/events/ws?session_id=nope") as ws:
+            ws.receive_json()
+
+
+def test_fleet_stream_rejects_unknown_session_id(client):
+    assert client.get("/events/stream", params={"session_id": "../reports/segments/index"}).status_code == 404